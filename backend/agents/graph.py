@@ -1,20 +1,30 @@
 """
 LangGraph agent for restaurant assistance.
 """
+import asyncio
+import functools
+import math
 import os
-from typing import TypedDict, Annotated, Sequence
+import threading
+from typing import TypedDict, Annotated, Literal, Sequence
+import httpx
+from cachetools import TLRUCache
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage, ToolMessage, trim_messages
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.messages.tool import ToolCall
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
 from langgraph.graph.message import add_messages
+from langgraph.cache.base import BaseCache
+from langgraph.types import CachePolicy, Command, Send
 from .tools import (
     lookup_menu, 
     check_food_stock, 
     get_order_status, 
     place_order, 
     search_faqs,
-    update_food_stock
+    update_food_stock,
+    prefetch_tool_data
 )
 from utils.logger import log_info, log_error
 
@@ -25,44 +35,93 @@ class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], add_messages]
 
 
+class ToolCallState(TypedDict):
+    """State handed to a single tool worker by the fan-out."""
+    call: ToolCall
+
+
+def _agent_cache_key(state: AgentState) -> str:
+    """
+    Build the cache key for the agent node from the conversation so far.
+    
+    User messages are normalised so near-identical prompts share an entry,
+    and tool results are part of the key so answers built on stale tool
+    output are never reused.
+    """
+    parts = []
+    for message in state["messages"]:
+        if isinstance(message, HumanMessage):
+            parts.append(("human", message.content.strip().lower()))
+        elif isinstance(message, AIMessage):
+            parts.append(("ai", message.content, [(c["name"], c["args"]) for c in message.tool_calls]))
+        else:
+            parts.append((message.type, message.content))
+    return repr(parts)
+
+
+class _BoundedNodeCache(BaseCache):
+    """
+    Node cache holding at most maxsize entries, each dropped once its TTL passes.
+    
+    LangGraph's InMemoryCache only evicts an expired entry when the same key
+    is read again, so every distinct prompt would stay in memory forever.
+    """
+    
+    def __init__(self, maxsize: int = 1024):
+        """Create an empty cache holding up to maxsize entries."""
+        super().__init__()
+        # Entries are (encoding, payload, ttl); expired ones are purged on every write
+        self._cache = TLRUCache(
+            maxsize=maxsize,
+            ttu=lambda _key, value, now: now + value[2] if value[2] is not None else math.inf
+        )
+        self._lock = threading.Lock()
+    
+    def get(self, keys):
+        """Get the cached values for the given keys, skipping expired ones."""
+        with self._lock:
+            return {
+                key: self.serde.loads_typed(entry[:2])
+                for key in keys
+                if (entry := self._cache.get(key)) is not None
+            }
+    
+    async def aget(self, keys):
+        """Asynchronously get the cached values for the given keys."""
+        return self.get(keys)
+    
+    def set(self, pairs):
+        """Store values with their TTLs, evicting expired or least recent entries."""
+        with self._lock:
+            for key, (value, ttl) in pairs.items():
+                self._cache[key] = (*self.serde.dumps_typed(value), ttl)
+    
+    async def aset(self, pairs):
+        """Asynchronously store values with their TTLs."""
+        self.set(pairs)
+    
+    def clear(self, namespaces=None):
+        """Delete the cached values for the given namespaces, or all of them."""
+        with self._lock:
+            if namespaces is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] in namespaces]:
+                    del self._cache[key]
+    
+    async def aclear(self, namespaces=None):
+        """Asynchronously delete the cached values for the given namespaces."""
+        self.clear(namespaces)
+
+
+# Token budget for the conversation history sent with each model call
+MAX_HISTORY_TOKENS = 2000
+
+
 # System prompt for the restaurant agent
-SYSTEM_PROMPT = """You are a friendly restaurant assistant for our Indian restaurant. Your ONLY role is to help customers with restaurant-related queries.
-
-🎯 YOUR RESPONSIBILITIES:
-1. Greet customers warmly with Indian hospitality (use phrases like "Namaste!", "Welcome!", etc.)
-2. Show the menu from our Google Sheets database
-3. Answer questions about our dishes, ingredients, and prices
-4. Take orders and provide order confirmations
-5. Check order status
-6. Answer FAQs about the restaurant (timings, delivery, payments, etc.)
-7. Provide food recommendations based on preferences
-
-🚫 STRICT BOUNDARIES - YOU MUST REFUSE:
-- Questions about programming, technology, math, science, or any non-restaurant topics
-- General knowledge questions (history, geography, definitions, etc.)
-- Personal advice or opinions unrelated to food
-- Any topic that is NOT about this restaurant, our menu, orders, or food
-
-If someone asks about non-restaurant topics, politely respond with:
-"I apologize, but I'm specifically designed to help with our restaurant services only. I can assist you with our menu, orders, timings, and food-related questions. How may I help you with that?"
-
-📋 AVAILABLE TOOLS:
-- lookup_menu: Get menu items with prices (₹ INR) from Google Sheets
-- check_food_stock: Check ingredient availability  
-- get_order_status: Check order status
-- place_order: Place customer orders
-- search_faqs: Search restaurant FAQs
-- update_food_stock: Update inventory (management only)
-
-🎨 PERSONALITY:
-- Be warm, friendly, and enthusiastic about food
-- Use emojis occasionally (🍛 🥘 🍜 😊)
-- Be conversational but stay professional
-- Always recommend dishes when appropriate
-- Show pride in our authentic Indian cuisine
-- Prices are in Indian Rupees (₹)
-
-Remember: You are ONLY a restaurant assistant. Stay in character and refuse all non-restaurant questions politely but firmly."""
+SYSTEM_PROMPT = """You are a warm, friendly assistant for our Indian restaurant. Help customers with our menu, dishes, prices (in ₹), orders, order status, restaurant FAQs and food recommendations. Greet with Indian hospitality ("Namaste!") and use the occasional food emoji.
+
+Only discuss this restaurant and its food. For anything else, reply: "I apologize, but I can only help with our restaurant's menu, orders, timings and food-related questions. How may I help you with that?\""""
 
 
 class RestaurantAgent:
@@ -75,11 +134,20 @@ class RestaurantAgent:
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
         
+        # One pooled HTTP/2 client for every OpenAI call, so concurrent
+        # requests share warm connections instead of opening new ones
+        self._http = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        
         # Initialize the language model
         self.llm = ChatOpenAI(
             model="gpt-4.1-mini",
             temperature=0.7,
-            api_key=api_key
+            api_key=api_key,
+            http_async_client=self._http
         )
         
         # Bind tools to the LLM
@@ -91,7 +159,11 @@ class RestaurantAgent:
             search_faqs,
             update_food_stock
         ]
-        self.llm_with_tools = self.llm.bind_tools(self.tools)
+        self.llm_with_tools = self.llm.bind_tools(self.tools, parallel_tool_calls=True)
+        self.tools_by_name = {t.name: t for t in self.tools}
+        
+        # The system prompt never changes, so build its message once
+        self._system_msg = SystemMessage(content=SYSTEM_PROMPT)
         
         # Build the graph
         self.graph = self._build_graph()
@@ -103,54 +175,95 @@ class RestaurantAgent:
         workflow = StateGraph(AgentState)
         
         # Add nodes
-        workflow.add_node("agent", self._call_model)
-        workflow.add_node("tools", ToolNode(self.tools))
-        
-        # Set entry point
-        workflow.set_entry_point("agent")
-        
-        # Add conditional edges
-        workflow.add_conditional_edges(
+        # Identical prompts within a minute reuse the model's previous reply
+        workflow.add_node(
             "agent",
-            self._should_continue,
-            {
-                "continue": "tools",
-                "end": END
-            }
+            self._call_model,
+            cache_policy=CachePolicy(key_func=_agent_cache_key, ttl=60)
         )
+        workflow.add_node("tool_exec", self._execute_tool)
+        
+        # Set entry point; the agent node routes itself via Command
+        workflow.set_entry_point("agent")
         
-        # Add edge from tools back to agent
-        workflow.add_edge("tools", "agent")
+        # Add edge from tools back to agent (runs once all workers finish)
+        workflow.add_edge("tool_exec", "agent")
         
         # Compile the graph
-        return workflow.compile()
+        return workflow.compile(cache=_BoundedNodeCache())
     
-    def _call_model(self, state: AgentState):
-        """Call the language model with the current state."""
+    async def _call_model(self, state: AgentState) -> Command[Literal["tool_exec", "__end__"]]:
+        """Call the language model and route to the tools or the end."""
         messages = state["messages"]
         
         # Add system message if this is the first interaction
         if len(messages) == 1 and isinstance(messages[0], HumanMessage):
-            messages = [SystemMessage(content=SYSTEM_PROMPT)] + messages
+            messages = [self._system_msg, *messages]
+        
+        # Keep the prompt bounded as tool loops grow the history
+        messages = self._trim_history(messages)
         
         # Call the model
-        response = self.llm_with_tools.invoke(messages)
+        response = await self.llm_with_tools.ainvoke(messages)
+        
+        # If the response has tool calls, run each of them in parallel
+        if response.tool_calls:
+            # Load the sheets the tools read with one batched request
+            await asyncio.to_thread(prefetch_tool_data, response.tool_calls)
+            goto = [Send("tool_exec", {"call": tool_call}) for tool_call in response.tool_calls]
+        else:
+            goto = END
         
-        # Return the updated state
-        return {"messages": [response]}
+        # Update the state and route in a single step
+        return Command(update={"messages": [response]}, goto=goto)
     
-    def _should_continue(self, state: AgentState):
-        """Determine if the agent should continue or end."""
-        last_message = state["messages"][-1]
+    def _trim_history(self, messages: Sequence[BaseMessage]) -> list:
+        """Drop the oldest whole turns once the history exceeds MAX_HISTORY_TOKENS."""
+        trimmed = trim_messages(
+            messages,
+            max_tokens=MAX_HISTORY_TOKENS,
+            strategy="last",
+            token_counter=count_tokens_approximately,
+            include_system=True,
+            start_on="human"
+        )
+        
+        # Never drop the turn in progress, even if it alone is over budget
+        human_positions = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+        if human_positions and not any(isinstance(m, HumanMessage) for m in trimmed):
+            start = human_positions[-1]
+            trimmed = [m for m in messages[:start] if isinstance(m, SystemMessage)] + list(messages[start:])
+        
+        return trimmed
+    
+    async def _execute_tool(self, state: ToolCallState):
+        """Run a single tool call and return its result as a ToolMessage."""
+        call = state["call"]
+        tool = self.tools_by_name.get(call["name"])
+        
+        if tool is None:
+            content = f"Error: {call['name']} is not a valid tool."
+            return {"messages": [ToolMessage(content=content, name=call["name"], tool_call_id=call["id"])]}
         
-        # If the last message has tool calls, continue to tools
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "continue"
+        try:
+            # Invoking with the full tool call returns a ToolMessage
+            result = await tool.ainvoke({**call, "type": "tool_call"})
+        except Exception as e:
+            log_error(e, f"Error running tool {call['name']}")
+            result = ToolMessage(
+                content=f"Error: {str(e)}",
+                name=call["name"],
+                tool_call_id=call["id"],
+                status="error"
+            )
         
-        # Otherwise, end
-        return "end"
+        return {"messages": [result]}
+    
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        await self._http.aclose()
     
-    def process_message(self, user_message: str) -> str:
+    async def process_message(self, user_message: str) -> str:
         """
         Process a user message and return the agent's response.
         
@@ -169,7 +282,7 @@ class RestaurantAgent:
             }
             
             # Run the graph
-            result = self.graph.invoke(initial_state)
+            result = await self.graph.ainvoke(initial_state)
             
             # Extract the final response
             final_message = result["messages"][-1]
@@ -183,13 +296,7 @@ class RestaurantAgent:
             return "I apologize, but I'm having trouble processing your request right now. Please try again."
 
 
-# Create a singleton instance
-_agent_instance = None
-
-
+@functools.cache
 def get_agent() -> RestaurantAgent:
     """Get or create the restaurant agent instance."""
-    global _agent_instance
-    if _agent_instance is None:
-        _agent_instance = RestaurantAgent()
-    return _agent_instance
\ No newline at end of file
+    return RestaurantAgent()
@@ -3,9 +3,91 @@ Tools for the restaurant agent.
 """
 import json
 import os
+import threading
 from pathlib import Path
+from cachetools import TTLCache
 from langchain_core.tools import tool
 from typing import Optional
+from utils.logger import log_error
+from utils.sheets_db import GoogleSheetsDB, get_sheets_db
+
+
+# Formatted tool output cached in-process to skip the Sheets round-trip.
+# The menu changes more often than the FAQs, so it gets a shorter TTL.
+_menu_cache = TTLCache(maxsize=8, ttl=60)
+_faq_cache = TTLCache(maxsize=64, ttl=300)
+_cache_lock = threading.Lock()
+
+# Google Sheets connection shared by every tool call
+_db = None
+
+
+def _db_conn() -> GoogleSheetsDB:
+    """Get the shared Google Sheets connection, connecting on first use."""
+    global _db
+    if _db is None:
+        _db = get_sheets_db()
+    return _db
+
+
+# Column names the menu sheet may use, in order of preference
+_DISH_NAME_KEYS = ('Dish Name', 'Item Name', 'Name', 'Dish')
+_PRICE_KEYS = ('Price (INR)', 'Price', 'Rate')
+
+
+def _extract(item: dict, keys: tuple, default):
+    """Get the first non-empty value among several possible column names."""
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return default
+
+
+def _menu_key(category: Optional[str]):
+    """Cache key for lookup_menu output."""
+    return category or "__all__"
+
+
+def _faq_key(category: Optional[str], query: Optional[str]):
+    """Cache key for search_faqs output."""
+    # Filters are case-insensitive, so normalise the cache key the same way
+    return ((category or "").lower(), (query or "").lower())
+
+
+def prefetch_tool_data(tool_calls: list) -> None:
+    """
+    Fetch the worksheets needed by a batch of tool calls in one request.
+    
+    Called before parallel tool calls run, so that their sheet reads are
+    served by a single values.batchGet instead of one request per tool.
+    Tools whose output is already cached don't need their worksheet.
+    
+    Args:
+        tool_calls: Tool calls requested by the model in one step
+    """
+    try:
+        db = _db_conn()
+        sheets = set()
+        
+        with _cache_lock:
+            for call in tool_calls:
+                args = call.get("args", {})
+                if call["name"] == "lookup_menu" and _menu_key(args.get("category")) not in _menu_cache:
+                    sheets.add(db.get_menu_sheet_name())
+                elif call["name"] == "check_food_stock":
+                    sheets.add('Stocks')
+                elif call["name"] == "search_faqs" and _faq_key(args.get("category"), args.get("query")) not in _faq_cache:
+                    sheets.add('FAQs')
+                elif call["name"] == "get_order_status" and not args.get("order_id"):
+                    sheets.add('Orders')
+        
+        # A single worksheet gains nothing from batching
+        if len(sheets) > 1:
+            db.prefetch(sheets)
+    except Exception as e:
+        # Tools fall back to fetching their own worksheet
+        log_error(e, "Error prefetching sheets")
 
 
 @tool
@@ -20,42 +102,30 @@ def lookup_menu(category: str = None) -> str:
         A formatted string containing menu items with names and prices.
     """
     try:
-        from utils.sheets_db import get_sheets_db
+        cache_key = _menu_key(category)
+        with _cache_lock:
+            cached = _menu_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        db = get_sheets_db()
+        db = _db_conn()
         
-        # Try to get Menu worksheet, fallback to Stocks if Menu doesn't exist
-        try:
-            worksheet = db.spreadsheet.worksheet('Menu')
-        except:
-            worksheet = db.spreadsheet.worksheet('Stocks')
-        
-        records = worksheet.get_all_records()
+        # Menu worksheet, or Stocks if Menu doesn't exist
+        records = db.get_records(db.get_menu_sheet_name())
         
         if not records:
             return "Menu is currently unavailable. Please try again later."
         
-        # Debug: Print first record to see column names
-        if records:
-            print(f"DEBUG - Available columns: {list(records[0].keys())}")
-        
         # If no category specified, return all items
-        result = "**Our Menu:**\n\n"
-        for item in records:
-            # Try different possible column names
-            dish_name = (item.get('Dish Name') or 
-                        item.get('Item Name') or 
-                        item.get('Name') or 
-                        item.get('Dish') or 
-                        'Unknown')
-            
-            price = (item.get('Price (INR)') or 
-                    item.get('Price') or 
-                    item.get('Rate') or 
-                    0)
-            
-            result += f"- {dish_name}: ₹{price}\n"
+        parts = ["**Our Menu:**\n\n"]
+        parts.extend(
+            f"- {_extract(item, _DISH_NAME_KEYS, 'Unknown')}: ₹{_extract(item, _PRICE_KEYS, 0)}\n"
+            for item in records
+        )
+        result = "".join(parts)
         
+        with _cache_lock:
+            _menu_cache[cache_key] = result
         return result
         
     except Exception as e:
@@ -74,28 +144,34 @@ def check_food_stock(item_name: Optional[str] = None) -> str:
         A formatted string containing stock information.
     """
     try:
-        from utils.sheets_db import get_sheets_db
+        db = _db_conn()
         
-        db = get_sheets_db()
-        stocks = db.get_food_stocks(item_name)
+        if item_name:
+            # Exact names are an index hit; partial names fall back to a scan
+            stock = db.get_stock(item_name)
+            stocks = [stock] if stock else db.get_food_stocks(item_name)
+        else:
+            stocks = db.get_food_stocks()
         
         if not stocks:
             if item_name:
                 return f"No stock information found for '{item_name}'."
             return "Stock information is currently unavailable. Please contact the restaurant."
         
-        result = "**Current Food Stocks:**\n\n"
+        parts = ["**Current Food Stocks:**\n\n"]
         for stock in stocks:
-            result += f"- {stock.get('Item Name', 'Unknown')}: "
-            result += f"{stock.get('Quantity', 0)} {stock.get('Unit', 'units')} "
-            result += f"(₹{stock.get('Price', 0)} per {stock.get('Unit', 'unit')})\n"
-            result += f"  Category: {stock.get('Category', 'N/A')}\n"
+            parts.append(
+                f"- {stock.get('Item Name', 'Unknown')}: "
+                f"{stock.get('Quantity', 0)} {stock.get('Unit', 'units')} "
+                f"(₹{stock.get('Price', 0)} per {stock.get('Unit', 'unit')})\n"
+                f"  Category: {stock.get('Category', 'N/A')}\n"
+            )
         
-        return result
+        return "".join(parts)
         
     except Exception as e:
         error_msg = str(e)
-        print(f"ERROR in check_food_stock: {error_msg}")
+        log_error(e, "Error in check_food_stock")
         if "credentials" in error_msg.lower():
             return "Unable to access stock database. Google Sheets credentials are not configured properly."
         elif "sheet" in error_msg.lower():
@@ -116,30 +192,31 @@ def get_order_status(order_id: Optional[str] = None, status_filter: Optional[str
         A formatted string containing order information.
     """
     try:
-        from utils.sheets_db import get_sheets_db
-        
-        db = get_sheets_db()
-        orders = db.get_orders(status_filter)
+        db = _db_conn()
         
-        if not orders:
-            return "No orders found."
-        
-        # If looking for specific order
+        # If looking for specific order, fetch just that row
         if order_id:
-            orders = [o for o in orders if o.get('Order ID', '').upper() == order_id.upper()]
-            if not orders:
+            order = db.get_order(order_id)
+            if not order or (status_filter and order.get('Status', '').lower() != status_filter.lower()):
                 return f"Order {order_id} not found."
+            orders = [order]
+        else:
+            orders = db.get_orders(status_filter)
+            if not orders:
+                return "No orders found."
         
-        result = "**Orders:**\n\n"
+        parts = ["**Orders:**\n\n"]
         for order in orders:
-            result += f"- Order ID: {order.get('Order ID', 'N/A')}\n"
-            result += f"  Customer: {order.get('Customer Name', 'N/A')}\n"
-            result += f"  Items: {order.get('Items', 'N/A')}\n"
-            result += f"  Total: ₹{order.get('Total', 0)}\n"
-            result += f"  Status: {order.get('Status', 'N/A')}\n"
-            result += f"  Time: {order.get('Timestamp', 'N/A')}\n\n"
+            parts.append(
+                f"- Order ID: {order.get('Order ID', 'N/A')}\n"
+                f"  Customer: {order.get('Customer Name', 'N/A')}\n"
+                f"  Items: {order.get('Items', 'N/A')}\n"
+                f"  Total: ₹{order.get('Total', 0)}\n"
+                f"  Status: {order.get('Status', 'N/A')}\n"
+                f"  Time: {order.get('Timestamp', 'N/A')}\n\n"
+            )
         
-        return result
+        return "".join(parts)
         
     except Exception as e:
         return f"Unable to fetch order information. Error: {str(e)}"
@@ -159,13 +236,11 @@ def place_order(customer_name: str, items: str, total: float) -> str:
         Confirmation message with order details.
     """
     try:
-        from utils.sheets_db import get_sheets_db
+        db = _db_conn()
+        order_id = db.add_order(customer_name, items, total)
         
-        db = get_sheets_db()
-        success = db.add_order(customer_name, items, total)
-        
-        if success:
-            return f"✅ Order placed successfully!\n\nCustomer: {customer_name}\nItems: {items}\nTotal: ₹{total}\nStatus: Pending"
+        if order_id:
+            return f"✅ Order placed successfully!\n\nOrder ID: {order_id}\nCustomer: {customer_name}\nItems: {items}\nTotal: ₹{total}\nStatus: Pending"
         else:
             return "❌ Failed to place order. Please try again."
         
@@ -186,20 +261,29 @@ def search_faqs(query: Optional[str] = None, category: Optional[str] = None) ->
         A formatted string containing matching FAQs.
     """
     try:
-        from utils.sheets_db import get_sheets_db
+        cache_key = _faq_key(category, query)
+        with _cache_lock:
+            cached = _faq_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        db = get_sheets_db()
+        db = _db_conn()
         faqs = db.get_faqs(category, query)
         
         if not faqs:
             return "No FAQs found matching your query."
         
-        result = "**Frequently Asked Questions:**\n\n"
+        parts = ["**Frequently Asked Questions:**\n\n"]
         for faq in faqs:
-            result += f"**Q: {faq.get('Question', 'N/A')}**\n"
-            result += f"A: {faq.get('Answer', 'N/A')}\n"
-            result += f"_(Category: {faq.get('Category', 'N/A')})_\n\n"
+            parts.append(
+                f"**Q: {faq.get('Question', 'N/A')}**\n"
+                f"A: {faq.get('Answer', 'N/A')}\n"
+                f"_(Category: {faq.get('Category', 'N/A')})_\n\n"
+            )
+        result = "".join(parts)
         
+        with _cache_lock:
+            _faq_cache[cache_key] = result
         return result
         
     except Exception as e:
@@ -219,12 +303,13 @@ def update_food_stock(item_name: str, new_quantity: int) -> str:
         Confirmation message.
     """
     try:
-        from utils.sheets_db import get_sheets_db
-        
-        db = get_sheets_db()
+        db = _db_conn()
         success = db.update_stock(item_name, new_quantity)
         
         if success:
+            # The menu may be served from the Stocks sheet, so drop cached copies
+            with _cache_lock:
+                _menu_cache.clear()
             return f"✅ Stock updated: {item_name} quantity set to {new_quantity}"
         else:
             return f"❌ Failed to update stock for {item_name}"
@@ -73,6 +73,12 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the agent's network connections on shutdown."""
+    await get_agent().aclose()
+
+
 @app.get("/")
 async def root():
     """Root endpoint to verify API is running."""
@@ -111,7 +117,7 @@ async def chat(request: ChatRequest):
         agent = get_agent()
         
         # Process the message through the agent
-        reply = agent.process_message(request.message)
+        reply = await agent.process_message(request.message)
         
         # Log agent response
         log_message("AGENT_RESPONSE", reply)
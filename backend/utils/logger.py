@@ -1,7 +1,31 @@
 """
 Simple logger utility for tracking agent interactions.
+
+Records are handed to a background thread through a queue, so logging from
+the request path never blocks on formatting or writing to stdout.
 """
-from datetime import datetime
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+
+logger = logging.getLogger("agent")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+
+_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_queue))
+_listener = QueueListener(_queue, _handler)
+_listener.start()
+
+# Flush whatever is still queued when the process exits
+atexit.register(_listener.stop)
 
 
 def log_message(message_type: str, content: str, metadata: dict = None):
@@ -13,13 +37,10 @@ def log_message(message_type: str, content: str, metadata: dict = None):
         content: The actual message content
         metadata: Additional context (optional)
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] [{message_type}] {content}"
-    
     if metadata:
-        log_entry += f" | Metadata: {metadata}"
-    
-    print(log_entry)
+        logger.info("[%s] %s | Metadata: %s", message_type, content, metadata)
+    else:
+        logger.info("[%s] %s", message_type, content)
 
 
 def log_error(error: Exception, context: str = ""):
@@ -30,8 +51,7 @@ def log_error(error: Exception, context: str = ""):
         error: The exception that occurred
         context: Additional context about where the error occurred
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [ERROR] {context}: {str(error)}")
+    logger.error("%s: %s", context, error)
 
 
 def log_info(message: str):
@@ -41,5 +61,4 @@ def log_info(message: str):
     Args:
         message: Info message to log
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [INFO] {message}")
\ No newline at end of file
+    logger.info("%s", message)
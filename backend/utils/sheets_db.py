@@ -2,142 +2,536 @@
 Google Sheets database helper module.
 Handles all interactions with Google Sheets as a database.
 """
+import asyncio
+import functools
+import json
 import os
+import random
+import re
+import secrets
+import threading
+import time
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from typing import List, Dict, Optional
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from requests.adapters import HTTPAdapter
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, List, Dict, Optional, Union
 from pathlib import Path
 from dotenv import load_dotenv
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Load environment variables
 load_dotenv()
 
+log = logger.getChild("sheets")
+
+# Connection settings, resolved once when the module loads
+SHEET_ID = os.getenv('GOOGLE_SHEET_ID')
+CREDENTIALS_JSON = os.getenv('GOOGLE_CREDENTIALS_JSON')
+CREDENTIALS_PATH = Path(os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials.json'))
+
+# Make credentials path absolute
+if not CREDENTIALS_PATH.is_absolute():
+    CREDENTIALS_PATH = Path(__file__).parent.parent / CREDENTIALS_PATH
+
+if not SHEET_ID:
+    log.warning("GOOGLE_SHEET_ID environment variable is not set; Google Sheets is unavailable")
+
+# How long (in seconds) fetched worksheet records are served from memory
+RECORDS_TTL = 30
+
+# How often (in seconds) a background thread reloads the cached sheets;
+# shorter than RECORDS_TTL so reads are served from a warm cache
+SYNC_INTERVAL = 25
+
+# OAuth scopes requested for the service account
+_SCOPES = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive'
+]
+
+# Typed cell values (numbers stay numbers), with dates kept as display strings
+_READ_PARAMS = {
+    'valueRenderOption': 'UNFORMATTED_VALUE',
+    'dateTimeRenderOption': 'FORMATTED_STRING'
+}
+
+
+# Sheets API statuses worth retrying: rate limiting and transient server errors
+_RETRY_STATUSES = {429, 500, 502, 503}
+
+# Formats of the order timestamp and the stock "Last Updated" date
+_TS_FMT = '%Y-%m-%d %H:%M:%S'
+_DATE_FMT = '%Y-%m-%d'
+
+
+# Columns the filters search, kept casefolded alongside the cached records
+# as one tuple per row, in this order
+_SEARCH_COLUMNS = {
+    'Stocks': ('Item Name',),
+    'Orders': ('Status',),
+    'FAQs': ('Category',)
+}
+
+
+def _as_text(value: str) -> str:
+    """Keep user-supplied text literal when the sheet parses input like a user typed it."""
+    return f"'{value}" if value[:1] in ('=', '+', '-', '@') else value
+
+
+def _new_order_id() -> str:
+    """
+    Make an order ID without reading the sheet, e.g. ORD-261015-4F2A9C01B7.
+    
+    The ID is written as a plain value, so it stays the same when rows
+    are deleted, sorted or inserted. Forty random bits a day keep clashes
+    out of reach even at thousands of orders a day.
+    """
+    return f"ORD-{datetime.now():%y%m%d}-{secrets.token_hex(5).upper()}"
+
+
+@functools.lru_cache(maxsize=None)
+def _credentials_from_json(info: str) -> Credentials:
+    """Parse service account credentials from a JSON string, once per process."""
+    return Credentials.from_service_account_info(json.loads(info), scopes=_SCOPES)
+
+
+@functools.lru_cache(maxsize=None)
+def _credentials_from_file(path: str) -> Credentials:
+    """Load service account credentials from a key file, once per process."""
+    return Credentials.from_service_account_file(path, scopes=_SCOPES)
+
+
+def _retry(fn, *args, tries: int = 6, base: float = 0.5, statuses=_RETRY_STATUSES, **kwargs):
+    """
+    Call a Sheets API function, retrying with jittered exponential backoff.
+    
+    Args:
+        fn: The gspread call to make
+        tries: Maximum number of attempts
+        base: Delay before the first retry in seconds, doubled on each attempt
+        statuses: HTTP statuses that trigger a retry
+        
+    Returns:
+        Whatever fn returns
+    """
+    for attempt in range(tries):
+        try:
+            return fn(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code not in statuses or attempt == tries - 1:
+                raise
+            time.sleep(base * 2 ** attempt + random.random() * 0.1)
+
+
+def _pandas():
+    """Import pandas, which is only needed for DataFrame results."""
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError("DataFrame results need pandas: pip install pandas") from e
+    return pandas
+
+
+def _contains(column: 'pd.Series', text: str) -> 'pd.Series':
+    """Case-insensitive substring mask over a DataFrame column."""
+    return column.astype(str).str.casefold().str.contains(text.casefold(), regex=False)
+
+
+def _equals(column: 'pd.Series', text: str) -> 'pd.Series':
+    """Case-insensitive equality mask over a DataFrame column."""
+    return column.astype(str).str.casefold() == text.casefold()
+
+
+def _fold_columns(headers: List[str], rows: List[List], columns: Iterable[str]) -> List[tuple]:
+    """Casefold the given columns of each row into a tuple, reading cells by column index."""
+    # None marks a column missing from the header row, so stray cells past it aren't read
+    positions = [headers.index(col) if col in headers else None for col in columns]
+    return [
+        tuple(str(row[i]).casefold() if i is not None and i < len(row) else '' for i in positions)
+        for row in rows
+    ]
+
+
+def _to_records(headers: List[str], rows: List[List]) -> List[Dict]:
+    """Build records from a header row and data rows, like worksheet.get_all_records()."""
+    width = len(headers)
+    return [dict(zip(headers, row + [''] * (width - len(row)))) for row in rows]
+
 
 class GoogleSheetsDB:
     """Manages Google Sheets database operations."""
     
     def __init__(self):
         """Initialize Google Sheets connection."""
-        self.sheet_id = os.getenv('GOOGLE_SHEET_ID')
-        self.credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH', 'credentials.json')
-        
-        # Make credentials path absolute
-        if not os.path.isabs(self.credentials_path):
-            backend_dir = Path(__file__).parent.parent
-            self.credentials_path = backend_dir / self.credentials_path
+        self.sheet_id = SHEET_ID
+        self.credentials_path = CREDENTIALS_PATH
         
         self.client = None
         self.spreadsheet = None
+        self._worksheets = {}
+        self._headers = {}
+        self._cache = {}
+        # Bumped by invalidate(), so a fetch that overlapped a write isn't cached
+        self._generations = {}
+        self._cache_lock = threading.Lock()
+        self._frames = {}
+        self._menu_sheet = None
+        self._stock_row_index = {}
         self._connect()
+        
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="sheets-sync", daemon=True)
+        self._sync_thread.start()
     
     def _connect(self):
         """Establish connection to Google Sheets."""
         try:
-            # Define the scope
-            scope = [
-                'https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive'
-            ]
+            # Verify Sheet ID exists before doing any OAuth work
+            if not self.sheet_id:
+                raise ValueError("GOOGLE_SHEET_ID environment variable is not set")
             
             # Try to authenticate using environment variable first (for production)
-            google_credentials_json = os.getenv('GOOGLE_CREDENTIALS_JSON')
-            
-            if google_credentials_json:
+            if CREDENTIALS_JSON:
                 # Use credentials from environment variable
-                import json
-                credentials_dict = json.loads(google_credentials_json)
-                credentials = ServiceAccountCredentials.from_json_keyfile_dict(
-                    credentials_dict, scope
-                )
-                print("✅ Using credentials from environment variable")
+                credentials = _credentials_from_json(CREDENTIALS_JSON)
+                log.info("Using credentials from environment variable")
             else:
                 # Fallback to credentials file (for local development)
-                if not os.path.exists(str(self.credentials_path)):
+                if not self.credentials_path.exists():
                     raise FileNotFoundError(
                         f"Credentials file not found at {self.credentials_path}. "
                         "Please set GOOGLE_CREDENTIALS_JSON environment variable or "
                         "provide credentials.json file."
                     )
-                credentials = ServiceAccountCredentials.from_json_keyfile_name(
-                    str(self.credentials_path), scope
-                )
-                print("✅ Using credentials from file")
+                credentials = _credentials_from_file(str(self.credentials_path))
+                log.info("Using credentials from file")
             
-            self.client = gspread.authorize(credentials)
-            
-            # Verify Sheet ID exists
-            if not self.sheet_id:
-                raise ValueError("GOOGLE_SHEET_ID environment variable is not set")
+            # Keep-alive session with a connection pool shared by every Sheets call
+            session = AuthorizedSession(credentials)
+            session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+            self.client = gspread.Client(auth=credentials, session=session)
             
             # Open the spreadsheet
-            self.spreadsheet = self.client.open_by_key(self.sheet_id)
-            print(f"✅ Successfully connected to Google Sheets! (Sheet ID: {self.sheet_id})")
+            self.spreadsheet = _retry(self.client.open_by_key, self.sheet_id)
+            
+            # Resolve every worksheet handle once, instead of on each call
+            self._worksheets = {ws.title: ws for ws in _retry(self.spreadsheet.worksheets)}
+            self._menu_sheet = 'Menu' if 'Menu' in self._worksheets else 'Stocks'
+            log.info("Connected to Google Sheets (Sheet ID: %s)", self.sheet_id)
+            
+            # Warm the records cache for the usual reads with one batchGet
+            try:
+                self._load(self._synced_sheets())
+            except Exception as e:
+                log.warning("Could not prefetch sheets: %s", e)
             
         except FileNotFoundError as e:
-            print(f"❌ Credentials file not found: {str(e)}")
+            log.error("Credentials file not found: %s", e)
             raise
         except ValueError as e:
-            print(f"❌ Configuration error: {str(e)}")
+            log.error("Configuration error: %s", e)
             raise
         except Exception as e:
-            print(f"❌ Failed to connect to Google Sheets: {str(e)}")
-            print(f"   Sheet ID: {self.sheet_id}")
-            print(f"   Credentials path: {self.credentials_path}")
+            log.error(
+                "Failed to connect to Google Sheets: %s (Sheet ID: %s, credentials path: %s)",
+                e, self.sheet_id, self.credentials_path
+            )
             raise
     
-    def get_food_stocks(self, item_name: Optional[str] = None) -> List[Dict]:
+    def worksheet(self, name: str) -> gspread.Worksheet:
+        """
+        Get a worksheet by name from the handles cached at connect time.
+        
+        Worksheets added after connecting are resolved on first use.
+        
+        Args:
+            name: Title of the worksheet
+            
+        Returns:
+            The cached gspread Worksheet
+        """
+        if name not in self._worksheets:
+            self._worksheets[name] = _retry(self.spreadsheet.worksheet, name)
+        return self._worksheets[name]
+    
+    def get_menu_sheet_name(self) -> str:
+        """Get the worksheet holding the menu: 'Menu', or 'Stocks' if there is none."""
+        if self._menu_sheet is None:
+            try:
+                self.worksheet('Menu')
+                self._menu_sheet = 'Menu'
+            except gspread.exceptions.WorksheetNotFound:
+                self._menu_sheet = 'Stocks'
+        return self._menu_sheet
+    
+    def batch_get_ranges(self, ranges: List[str]) -> List[List[List]]:
+        """
+        Fetch several ranges in a single values.batchGet request.
+        
+        Args:
+            ranges: A1 ranges to fetch, e.g. "'Stocks'!A:F"
+            
+        Returns:
+            The values of each range, in the same order as requested
+        """
+        response = _retry(self.spreadsheet.values_batch_get, ranges, params=_READ_PARAMS)
+        return [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+    
+    def prefetch(self, names: Iterable[str]) -> None:
+        """
+        Load several worksheets into the records cache with one request.
+        
+        Args:
+            names: Titles of the worksheets to load; fresh ones are skipped
+        """
+        stale = [name for name in dict.fromkeys(names) if self._cached_records(name) is None]
+        if stale:
+            self._load(stale)
+    
+    def _synced_sheets(self) -> List[str]:
+        """Get the menu, stock, order and FAQ sheets that exist in the spreadsheet."""
+        names = dict.fromkeys([self.get_menu_sheet_name(), 'Stocks', 'Orders', 'FAQs'])
+        return [name for name in names if name in self._worksheets]
+    
+    def _sync_loop(self):
+        """Reload the menu, stock, order and FAQ sheets every SYNC_INTERVAL seconds."""
+        while True:
+            time.sleep(SYNC_INTERVAL)
+            try:
+                self._load(self._synced_sheets())
+            except Exception as e:
+                log.warning("Background sheet sync failed: %s", e)
+    
+    def get_records(self, name: str) -> List[Dict]:
+        """
+        Get all records of a worksheet, served from memory for RECORDS_TTL seconds.
+        
+        Args:
+            name: Title of the worksheet
+            
+        Returns:
+            List of dictionaries, one per row (shared, do not modify)
+        """
+        return self._entry(name)[1]
+    
+    def _load(self, names: List[str]) -> Dict[str, tuple]:
+        """
+        Fetch worksheets with one batchGet and store their records in the cache.
+        
+        Returns:
+            The (fetched at, records, folded) entry built for each worksheet,
+            so callers don't have to read it back from a cache that another
+            thread may have invalidated meanwhile
+        """
+        started = time.monotonic()
+        generations = {name: self._generations.get(name, 0) for name in names}
+        blocks = self.batch_get_ranges([absolute_range_name(name) for name in names])
+        entries = {}
+        for name, values in zip(names, blocks):
+            # The header row comes with the data, so keep it for single-row reads
+            if values:
+                self._headers[name] = values[0]
+            headers, rows = (values[0], values[1:]) if values else ([], [])
+            records = _to_records(headers, rows)
+            # Fold the searched columns once per fetch rather than on every query
+            folded = _fold_columns(headers, rows, _SEARCH_COLUMNS.get(name, ()))
+            entries[name] = (started, records, folded)
+            
+            with self._cache_lock:
+                # The sheet was written while this fetch was in flight: the
+                # values may predate the write, so hand them back uncached
+                if self._generations.get(name, 0) != generations[name]:
+                    continue
+                self._cache[name] = entries[name]
+            
+            if name == 'Stocks':
+                # Sheet row of each item (data starts on row 2); first match wins
+                self._stock_row_index = {
+                    f[0]: row
+                    for row, f in reversed(list(enumerate(folded, start=2)))
+                }
+        return entries
+    
+    def _cached_records(self, name: str) -> Optional[List[Dict]]:
+        """Get the cached records of a worksheet, or None if missing or expired."""
+        entry = self._cached_entry(name)
+        return entry[1] if entry else None
+    
+    def _cached_entry(self, name: str) -> Optional[tuple]:
+        """Get the cached (fetched at, records, folded) entry of a worksheet, or None if missing or expired."""
+        cached = self._cache.get(name)
+        if cached and time.monotonic() - cached[0] < RECORDS_TTL:
+            return cached
+        return None
+    
+    def _entry(self, name: str) -> tuple:
+        """Get the (fetched at, records, folded) entry of a worksheet, loading it if needed."""
+        return self._cached_entry(name) or self._load([name])[name]
+    
+    def _folded_records(self, name: str) -> tuple:
+        """Get the records of a worksheet with their casefolded search columns."""
+        _, records, folded = self._entry(name)
+        return records, folded
+    
+    def get_frame(self, name: str) -> 'pd.DataFrame':
+        """
+        Get all records of a worksheet as a pandas DataFrame.
+        
+        The frame is built from the cached records, once per fetch.
+        
+        Args:
+            name: Title of the worksheet
+            
+        Returns:
+            DataFrame with one row per record (shared, do not modify in place)
+        """
+        pd = _pandas()
+        fetched, records, _ = self._entry(name)
+        
+        frame = self._frames.get(name)
+        if frame is None or frame[0] != fetched:
+            frame = (fetched, pd.DataFrame(records, columns=self._headers.get(name)))
+            self._frames[name] = frame
+        return frame[1]
+    
+    def invalidate(self, name: str) -> None:
+        """Drop the cached records of a worksheet after it was modified."""
+        with self._cache_lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            self._cache.pop(name, None)
+            self._frames.pop(name, None)
+    
+    def get_food_stocks(self, item_name: Optional[str] = None,
+                        as_dataframe: bool = False) -> Union[List[Dict], 'pd.DataFrame']:
         """
         Get food stock information.
         
         Args:
             item_name: Optional item name to filter by
+            as_dataframe: Return a pandas DataFrame instead of a list
             
         Returns:
-            List of dictionaries containing stock information
+            List of dictionaries (or a DataFrame) containing stock information
         """
+        # A missing pandas is a setup error, not a fetch failure
+        pd = _pandas() if as_dataframe else None
         try:
-            worksheet = self.spreadsheet.worksheet('Stocks')
-            records = worksheet.get_all_records()
+            if as_dataframe:
+                frame = self.get_frame('Stocks')
+                if item_name:
+                    frame = frame[_contains(frame['Item Name'], item_name)]
+                return frame
             
-            if item_name:
-                # Filter by item name (case-insensitive)
-                records = [
-                    r for r in records 
-                    if item_name.lower() in r.get('Item Name', '').lower()
-                ]
+            if not item_name:
+                return self.get_records('Stocks')
             
-            return records
+            # Filter by item name (case-insensitive)
+            records, folded = self._folded_records('Stocks')
+            needle = item_name.casefold()
+            return [r for r, f in zip(records, folded) if needle in f[0]]
         except Exception as e:
-            print(f"Error fetching food stocks: {str(e)}")
-            return []
+            log.error("Error fetching food stocks: %s", e)
+            return pd.DataFrame() if as_dataframe else []
     
-    def get_orders(self, status: Optional[str] = None) -> List[Dict]:
+    def get_stock(self, item_name: str) -> Optional[Dict]:
+        """
+        Get the stock record whose item name matches exactly (case-insensitive).
+        
+        Args:
+            item_name: Name of the item
+            
+        Returns:
+            Dictionary containing the stock information, or None if not found
+        """
+        try:
+            _, records, folded = self._entry('Stocks')
+            wanted = item_name.casefold()
+            # The row index may belong to a newer or older snapshot, so check it against this one
+            row = self._stock_row_index.get(wanted)
+            if row is not None and row - 2 < len(folded) and folded[row - 2][0] == wanted:
+                return records[row - 2]
+            return next((r for r, f in zip(records, folded) if f[0] == wanted), None)
+        except Exception as e:
+            log.error("Error fetching stock for %s: %s", item_name, e)
+            return None
+    
+    def get_orders(self, status: Optional[str] = None,
+                   as_dataframe: bool = False) -> Union[List[Dict], 'pd.DataFrame']:
         """
         Get order information.
         
         Args:
             status: Optional status to filter by (e.g., 'Pending', 'Completed')
+            as_dataframe: Return a pandas DataFrame instead of a list
+            
+        Returns:
+            List of dictionaries (or a DataFrame) containing order information
+        """
+        pd = _pandas() if as_dataframe else None
+        try:
+            if as_dataframe:
+                frame = self.get_frame('Orders')
+                if status:
+                    frame = frame[_equals(frame['Status'], status)]
+                return frame
+            
+            if not status:
+                return self.get_records('Orders')
+            
+            # Filter by status (case-insensitive)
+            records, folded = self._folded_records('Orders')
+            needle = status.casefold()
+            return [r for r, f in zip(records, folded) if f[0] == needle]
+        except Exception as e:
+            log.error("Error fetching orders: %s", e)
+            return pd.DataFrame() if as_dataframe else []
+    
+    def get_order(self, order_id: str) -> Optional[Dict]:
+        """
+        Get a single order by its ID.
+        
+        Only the Order ID column and the matching row are downloaded,
+        instead of the whole Orders sheet.
+        
+        Args:
+            order_id: The order ID to look up (case-insensitive)
             
         Returns:
-            List of dictionaries containing order information
+            Dictionary containing the order information, or None if not found
         """
         try:
-            worksheet = self.spreadsheet.worksheet('Orders')
-            records = worksheet.get_all_records()
+            worksheet = self.worksheet('Orders')
             
-            if status:
-                # Filter by status (case-insensitive)
-                records = [
-                    r for r in records 
-                    if r.get('Status', '').lower() == status.lower()
-                ]
+            # worksheet.find() downloads every cell, so scan the ID column only
+            order_ids = _retry(worksheet.col_values, 1)
+            wanted = order_id.upper()
+            row = next(
+                (i for i, value in enumerate(order_ids, start=1) if i > 1 and value.upper() == wanted),
+                None
+            )
+            if row is None:
+                return None
             
-            return records
+            headers = self._get_headers('Orders')
+            values = _retry(worksheet.row_values, row)
+            values += [''] * (len(headers) - len(values))
+            return dict(zip(headers, values))
         except Exception as e:
-            print(f"Error fetching orders: {str(e)}")
-            return []
+            log.error("Error fetching order %s: %s", order_id, e)
+            return None
+    
+    def _get_headers(self, name: str) -> List[str]:
+        """Get the header row of a worksheet, fetching it only once."""
+        if name not in self._headers:
+            self._headers[name] = _retry(self.worksheet(name).row_values, 1)
+        return self._headers[name]
     
-    def add_order(self, customer_name: str, items: str, total: float) -> bool:
+    def add_order(self, customer_name: str, items: str, total: float) -> Optional[str]:
         """
         Add a new order to the Orders sheet.
         
@@ -147,65 +541,107 @@ class GoogleSheetsDB:
             total: Total price
             
         Returns:
-            True if successful, False otherwise
+            The new order's ID if successful, None otherwise
         """
         try:
-            worksheet = self.spreadsheet.worksheet('Orders')
-            
-            # Get current timestamp
-            from datetime import datetime
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            row = self._order_row(customer_name, items, total)
+        except Exception as e:
+            log.error("Error adding order: %s", e)
+            return None
+        return row[0] if self._append_orders([row]) else None
+    
+    def add_orders(self, orders: Iterable[tuple]) -> bool:
+        """
+        Add several orders to the Orders sheet in one request.
+        
+        Args:
+            orders: (customer_name, items, total) tuples
             
-            # Get next order ID
-            records = worksheet.get_all_records()
-            next_id = f"ORD-{len(records) + 1:03d}"
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            rows = [self._order_row(*order) for order in orders]
+        except Exception as e:
+            log.error("Error adding orders: %s", e)
+            return False
+        return self._append_orders(rows) if rows else True
+    
+    def _order_row(self, customer_name: str, items: str, total: float) -> List:
+        """Build an Orders row, timestamped now."""
+        timestamp = datetime.now().strftime(_TS_FMT)
+        
+        # The sheet parses the pre-formatted total as a number (USER_ENTERED)
+        return [_new_order_id(), _as_text(customer_name), _as_text(items), f"{total:.2f}", 'Pending', timestamp]
+    
+    def _append_orders(self, rows: List[List]) -> bool:
+        """Append order rows to the Orders sheet in a single request."""
+        try:
+            worksheet = self.worksheet('Orders')
             
-            # Add new row
-            new_row = [next_id, customer_name, items, total, 'Pending', timestamp]
-            worksheet.append_row(new_row)
+            # Only retry when rate limited: a failed append may still have been written
+            _retry(
+                worksheet.append_rows, rows,
+                value_input_option='USER_ENTERED',
+                insert_data_option='INSERT_ROWS',
+                table_range='A1',
+                statuses={429}
+            )
+            self.invalidate('Orders')
             
-            print(f"✅ Order {next_id} added successfully!")
+            log.info("Order(s) added: %s", ", ".join(row[0] for row in rows))
             return True
             
         except Exception as e:
-            print(f"Error adding order: {str(e)}")
+            log.error("Error adding orders: %s", e)
             return False
     
-    def get_faqs(self, category: Optional[str] = None, search_query: Optional[str] = None) -> List[Dict]:
+    def get_faqs(self, category: Optional[str] = None, search_query: Optional[str] = None,
+                 as_dataframe: bool = False) -> Union[List[Dict], 'pd.DataFrame']:
         """
         Get FAQ information.
         
         Args:
             category: Optional category to filter by
             search_query: Optional search term to find in questions or answers
+            as_dataframe: Return a pandas DataFrame instead of a list
             
         Returns:
-            List of dictionaries containing FAQ information
+            List of dictionaries (or a DataFrame) containing FAQ information
         """
+        pd = _pandas() if as_dataframe else None
         try:
-            worksheet = self.spreadsheet.worksheet('FAQs')
-            records = worksheet.get_all_records()
+            if as_dataframe:
+                frame = self.get_frame('FAQs')
+                if category:
+                    frame = frame[_equals(frame['Category'], category)]
+                if search_query:
+                    frame = frame[_contains(frame['Question'], search_query) | _contains(frame['Answer'], search_query)]
+                return frame
+            
+            records, folded = self._folded_records('FAQs')
+            if not category and not search_query:
+                return records
             
+            rows = zip(records, folded)
             if category:
                 # Filter by category (case-insensitive)
-                records = [
-                    r for r in records 
-                    if r.get('Category', '').lower() == category.lower()
-                ]
+                category = category.casefold()
+                rows = (row for row in rows if row[1][0] == category)
             
             if search_query:
-                # Search in questions and answers
-                search_lower = search_query.lower()
-                records = [
-                    r for r in records 
-                    if search_lower in r.get('Question', '').lower() 
-                    or search_lower in r.get('Answer', '').lower()
-                ]
-            
-            return records
+                # Search in questions and answers, without lowering every row
+                pattern = re.compile(re.escape(search_query), re.IGNORECASE)
+                rows = (
+                    row for row in rows
+                    if pattern.search(str(row[0].get('Question', '')))
+                    or pattern.search(str(row[0].get('Answer', '')))
+                )
+            
+            return [r for r, _ in rows]
         except Exception as e:
-            print(f"Error fetching FAQs: {str(e)}")
-            return []
+            log.error("Error fetching FAQs: %s", e)
+            return pd.DataFrame() if as_dataframe else []
     
     def update_stock(self, item_name: str, new_quantity: int) -> bool:
         """
@@ -219,36 +655,102 @@ class GoogleSheetsDB:
             True if successful, False otherwise
         """
         try:
-            worksheet = self.spreadsheet.worksheet('Stocks')
+            worksheet = self.worksheet('Stocks')
             
-            # Find the item
-            cell = worksheet.find(item_name)
-            if cell:
-                # Update quantity (assuming Quantity is in column 3)
-                worksheet.update_cell(cell.row, 3, new_quantity)
+            row = self._stock_row(worksheet, item_name)
+            if row:
+                today = datetime.now().strftime(_DATE_FMT)
                 
-                # Update Last Updated date
-                from datetime import datetime
-                today = datetime.now().strftime('%Y-%m-%d')
-                worksheet.update_cell(cell.row, 6, today)
+                # Update quantity (column C) and Last Updated date (column F) in one request
+                _retry(worksheet.batch_update, [
+                    {'range': f'C{row}', 'values': [[new_quantity]]},
+                    {'range': f'F{row}', 'values': [[today]]}
+                ], raw=False)
+                self.invalidate('Stocks')
                 
-                print(f"✅ Stock updated for {item_name}")
+                log.info("Stock updated for %s", item_name)
                 return True
             else:
-                print(f"❌ Item '{item_name}' not found")
+                log.warning("Item '%s' not found", item_name)
                 return False
                 
         except Exception as e:
-            print(f"Error updating stock: {str(e)}")
+            log.error("Error updating stock: %s", e)
             return False
+    
+    def _stock_row(self, worksheet: gspread.Worksheet, item_name: str) -> Optional[int]:
+        """
+        Find the sheet row of a stock item before writing to it.
+        
+        The row comes from the cached Stocks records, which can be up to
+        RECORDS_TTL old, so its Item Name cell is checked first.
+        If rows moved since the fetch, the records are reloaded once.
+        
+        Args:
+            worksheet: The Stocks worksheet
+            item_name: Name of the item (case-insensitive)
+            
+        Returns:
+            The row number, or None if the item is not in the sheet
+        """
+        wanted = item_name.casefold()
+        
+        def holds_item(row: Optional[int]) -> bool:
+            if not row:
+                return False
+            # Check whichever column the index was built from
+            column = self._headers['Stocks'].index('Item Name') + 1
+            cell = _retry(worksheet.acell, rowcol_to_a1(row, column))
+            return str(cell.value or '').casefold() == wanted
+        
+        self._entry('Stocks')
+        row = self._stock_row_index.get(wanted)
+        if holds_item(row):
+            return row
+        
+        # Rows moved since the fetch: look the item up in fresh records
+        folded = self._load(['Stocks'])['Stocks'][2]
+        row = next((i for i, f in enumerate(folded, start=2) if f[0] == wanted), None)
+        return row if holds_item(row) else None
+    
+    # Async variants run the blocking Sheets calls in a worker thread,
+    # so they don't stall the event loop
+    
+    async def aget_food_stocks(self, item_name: Optional[str] = None) -> List[Dict]:
+        """Async version of get_food_stocks."""
+        return await asyncio.to_thread(self.get_food_stocks, item_name)
+    
+    async def aget_orders(self, status: Optional[str] = None) -> List[Dict]:
+        """Async version of get_orders."""
+        return await asyncio.to_thread(self.get_orders, status)
+    
+    async def aget_faqs(self, category: Optional[str] = None, search_query: Optional[str] = None) -> List[Dict]:
+        """Async version of get_faqs."""
+        return await asyncio.to_thread(self.get_faqs, category, search_query)
+    
+    async def aget_all(self) -> tuple:
+        """
+        Get stocks, orders and FAQs, loading whichever are stale in one batchGet.
+        
+        Returns:
+            (stocks, orders, faqs) lists of dictionaries
+        """
+        def load_all():
+            self.prefetch(['Stocks', 'Orders', 'FAQs'])
+            return self.get_food_stocks(), self.get_orders(), self.get_faqs()
+        return await asyncio.to_thread(load_all)
 
 
 # Create a singleton instance
 _db_instance = None
+_db_lock = threading.Lock()
 
 def get_sheets_db() -> GoogleSheetsDB:
     """Get or create the Google Sheets database instance."""
     global _db_instance
     if _db_instance is None:
-        _db_instance = GoogleSheetsDB()
+        # Only one caller connects; the others wait and reuse its instance
+        with _db_lock:
+            if _db_instance is None:
+                _db_instance = GoogleSheetsDB()
     return _db_instance